@@ -1 +1 @@
-from .changelog import add_skeleton, update, ChangelogError
+from .changelog import add_skeleton, update, update_many, ChangelogError
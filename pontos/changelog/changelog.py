@@ -16,8 +16,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import functools
 import re
-from typing import Tuple, List
+from typing import Generator, Iterable, Tuple, List
 from datetime import date
 
 
@@ -28,7 +29,6 @@ class ChangelogError(Exception):
 
 
 __UNRELEASED_MATCHER = re.compile('unreleased', re.IGNORECASE)
-__MASTER_MATCHER = re.compile('master|HEAD')
 
 __UNRELEASED_SKELETON = """## [Unreleased]
 ### Added
@@ -50,20 +50,23 @@ def add_skeleton(
     git_tag_prefix: str = 'v',
     git_space: str = 'greenbone',
 ) -> str:
+    # the skeleton is only added in front of a heading containing the version
+    if new_version not in markdown:
+        return markdown
+
     git_tag = '{}{}'.format(git_tag_prefix, new_version)
+    prepared_skeleton = __UNRELEASED_SKELETON.format(
+        git_space, project_name, git_tag
+    )
     tokens = _tokenize(markdown)
-    updated_markdown = ''
+    updated_parts = []
 
     for tt, _, tc in tokens:
         if tt == 'heading' and new_version in tc:
-            prepared_skeleton = __UNRELEASED_SKELETON.format(
-                git_space, project_name, git_tag
-            )
-            updated_markdown += prepared_skeleton + tc
-        else:
-            updated_markdown += tc
+            updated_parts.append(prepared_skeleton)
+        updated_parts.append(tc)
 
-    return updated_markdown
+    return ''.join(updated_parts)
 
 
 def update(
@@ -76,136 +79,240 @@ def update(
     update tokenizes CHANGELOG.md and if a version is given it changes
     unreleased headline and link to given version.
 
-    returns updated markdown and change log for further processing.
+    returns updated markdown and change log for further processing. The
+    change log has no leading and trailing newlines.
+    """
+    return _update(
+        markdown,
+        new_version,
+        git_tag_prefix,
+        containing_version,
+        date.today(),
+    )
+
+
+def update_many(
+    markdowns: Iterable[str],
+    new_version: str,
+    git_tag_prefix: str = 'v',
+    containing_version: str = None,
+) -> List[Tuple[str, str]]:
+    """
+    update_many updates several CHANGELOG.md contents (e.g. of a monorepo)
+    to the same version and release date.
+
+    returns a list of updated markdown and change log for each markdown.
     """
+    release_date = date.today()
+    return [
+        _update(
+            markdown,
+            new_version,
+            git_tag_prefix,
+            containing_version,
+            release_date,
+        )
+        for markdown in markdowns
+    ]
+
+
+@functools.lru_cache(maxsize=16)
+def _update(
+    markdown: str,
+    new_version: str,
+    git_tag_prefix: str,
+    containing_version: str,
+    release_date: date,
+) -> Tuple[str, str]:
+    # the release date is passed to be part of the cache key
+    positions = [
+        position
+        for position in (
+            markdown.find('Unreleased'),
+            markdown.find('unreleased'),
+        )
+        if position >= 0
+    ]
+    if not positions:
+        return ("", "")
+
+    # nothing changes before the line of the first possible unreleased heading
+    line_start = markdown.rfind('\n', 0, min(positions)) + 1
 
     git_tag = '{}{}'.format(git_tag_prefix, new_version)
-    tokens = _tokenize(markdown)
+    release_date_suffix = ' - {}'.format(release_date.isoformat())
+    tokens = _tokenize(markdown, line_start)
     unreleased_heading_count = 0
     changelog = ''
-    updated_markdown = ''
-    current_state = []
-    previous_state = []
+    updated_parts = [markdown[:line_start]]
+    in_unreleased = False
     unreleased = []
 
     for tt, hc, tc in tokens:
-        previous_state = current_state.copy()
+        was_in_unreleased = in_unreleased
 
         if tt == 'unreleased':
             if (
                 containing_version and containing_version in tc
             ) or not containing_version:
                 unreleased_heading_count = hc
-                current_state = [tt]
+                in_unreleased = True
         elif (
             tt == 'heading'
             and unreleased_heading_count > 0
             and hc <= unreleased_heading_count
         ):
-            current_state = []
+            in_unreleased = False
 
-        if 'unreleased' not in current_state and 'unreleased' in previous_state:
-            changelog = _prepare_changelog(unreleased, new_version, git_tag)
-            updated_markdown += changelog
-
-        if 'unreleased' not in current_state:
-            updated_markdown += tc
-
-        if 'unreleased' in current_state:
+        if in_unreleased:
             unreleased.append((tt, hc, tc))
+        else:
+            if was_in_unreleased:
+                changelog = _prepare_changelog(
+                    unreleased, new_version, git_tag, release_date_suffix
+                )
+                updated_parts.append(changelog)
 
-    if 'unreleased' in current_state and unreleased:
-        changelog = _prepare_changelog(unreleased, new_version, git_tag)
-        updated_markdown += changelog
+            updated_parts.append(tc)
+
+    if in_unreleased and unreleased:
+        changelog = _prepare_changelog(
+            unreleased, new_version, git_tag, release_date_suffix
+        )
+        updated_parts.append(changelog)
 
     return (
-        updated_markdown if changelog else "",
-        changelog,
+        ''.join(updated_parts) if changelog else "",
+        changelog.strip('\n'),
+    )
+
+
+def _replace_unreleased(text: str, new_version: str) -> str:
+    text = text.replace('Unreleased', new_version).replace(
+        'unreleased', new_version
     )
+    if __UNRELEASED_MATCHER.search(text):
+        # some other spelling like UNRELEASED is used additionally
+        text = __UNRELEASED_MATCHER.sub(new_version, text)
+
+    return text
 
 
 def _prepare_changelog(
-    tokens: List[Tuple[str, int, str]], new_version: str, git_tag: str
+    tokens: List[Tuple[str, int, str]],
+    new_version: str,
+    git_tag: str,
+    release_date_suffix: str,
 ) -> str:
     current = ''
     previous = ''
-    output = ''
-    keyword_text = ''
-    unreleased_link = ''
+    output = []
+    keyword_parts = []
+    unreleased_link = []
 
     for tt, _, tc in tokens:
         previous = current
 
         if tt == 'unreleased':
             if new_version:
-                tc = __UNRELEASED_MATCHER.sub(new_version, tc)
-                tc += ' - {}'.format(date.today().isoformat())
-            output += tc
+                tc = _replace_unreleased(tc, new_version)
+                tc += release_date_suffix
+            output.append(tc)
         elif tt == 'unreleased_link':
             if new_version:
-                tc = __UNRELEASED_MATCHER.sub(new_version, tc)
-                tc = __MASTER_MATCHER.sub(git_tag, tc)
-            unreleased_link += tc + '\n\n'
+                tc = _replace_unreleased(tc, new_version)
+                # only replace the compared ref, not parts of the url
+                url, separator, ref = tc.rpartition('...')
+                tc = (
+                    url
+                    + separator
+                    + ref.replace('master', git_tag).replace('HEAD', git_tag)
+                )
+            unreleased_link.append(tc)
+            unreleased_link.append('\n\n')
         elif 'kw_' in tt:
+            keyword_text = ''.join(keyword_parts)
             if keyword_text.strip().count('\n') > 0:
-                output += keyword_text
-            keyword_text = tc
+                output.append(keyword_text)
+            keyword_parts = [tc]
             current = tt
         elif 'kw_' in previous:
-            keyword_text += tc
+            keyword_parts.append(tc)
         else:
-            output += tc
+            output.append(tc)
 
+    keyword_text = ''.join(keyword_parts)
     if keyword_text.strip().count('\n') > 0:
-        output += keyword_text.strip() + '\n\n'
-
-    output += unreleased_link
-
-    return output
-
-
-def __build_scanner():
-    def token_handler(key: str):
-        """
-        generates a lambda for the regex scanner with a given key.
-
-        This lambda will return a tuple: key, count # of token and token.
-
-        The count is used to identify the level of heading on a special
-        ended which can be used to identify when this section ended.
-        """
-        return lambda _, token: (key, token.count('#'), token)
-
-    return re.Scanner(
-        [
-            (r'#{1,} [Aa]dded', token_handler('kw_added')),
-            (r'#{1,} [Cc]hanged', token_handler('kw_changed')),
-            (r'#{1,} [Dd]eprecated', token_handler('kw_deprecated')),
-            (r'#{1,} [Rr]emoved', token_handler('kw_removed')),
-            (r'#{1,} [Ff]ixed', token_handler('kw_fixed')),
-            (r'#{1,} [Ss]ecurity', token_handler('kw_security')),
-            (r'#{1,}.*(?=[Uu]nreleased).*', token_handler('unreleased')),
-            (
-                r'\[[Uu]nreleased\].*',
-                token_handler('unreleased_link'),
-            ),
-            (r'#{1,} .*', token_handler('heading')),
-            (r'\n', token_handler('newline')),
-            (r'..*', token_handler('any')),
-        ]
-    )
+        output.append(keyword_text.strip() + '\n\n')
+
+    output.extend(unreleased_link)
+
+    return ''.join(output)
+
+
+__KEYWORDS = (
+    'added',
+    'changed',
+    'deprecated',
+    'removed',
+    'fixed',
+    'security',
+)
 
 
-__CHANGELOG_SCANNER = __build_scanner()
+def _classify(text: str) -> Tuple[str, int]:
+    """
+    Classifies the beginning of a line (or the remainder of a line after a
+    keyword heading).
+
+    Returns the token type and the length of the token.
+    """
+    if text.startswith('#'):
+        hashes = len(text) - len(text.lstrip('#'))
+        rest = text[hashes:]
+        if rest.startswith(' '):
+            for keyword in __KEYWORDS:
+                if rest.startswith(keyword, 1) or rest.startswith(
+                    keyword.capitalize(), 1
+                ):
+                    return 'kw_' + keyword, hashes + 1 + len(keyword)
+
+        if 'nreleased' in rest and (
+            'unreleased' in rest or 'Unreleased' in rest
+        ):
+            return 'unreleased', len(text)
+
+        if rest.startswith(' '):
+            return 'heading', len(text)
+    elif text.startswith('[unreleased]') or text.startswith('[Unreleased]'):
+        return 'unreleased_link', len(text)
+
+    return 'any', len(text)
 
 
 def _tokenize(
     markdown: str,
-) -> List[Tuple[int, str, int, str],]:
-    toks, remainder = __CHANGELOG_SCANNER.scan(markdown)
-    if remainder != '':
-        raise ChangelogError(
-            "unrecognized tokens in markdown: {}".format(remainder)
-        )
+    start: int = 0,
+) -> Generator[Tuple[str, int, str], None, None]:
+    """
+    Splits the markdown beginning at the start offset line by line into
+    tokens of (token type, count of #, content).
+
+    The count of # is used to identify the level of a heading and therefore
+    when a section ended.
+    """
+    while True:
+        end = markdown.find('\n', start)
+        line = markdown[start:] if end < 0 else markdown[start:end]
+
+        while line:
+            token_type, length = _classify(line)
+            token = line[:length]
+            line = line[length:]
+            yield token_type, token.count('#'), token
+
+        if end < 0:
+            return
 
-    return toks
+        yield 'newline', 0, '\n'
+        start = end + 1
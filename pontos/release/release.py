@@ -22,9 +22,12 @@ import sys
 import subprocess
 import os
 import json
+import shlex
 import shutil
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import ModuleType
 from typing import Callable, Dict, List, Union, Tuple
 
 import requests
@@ -149,16 +152,16 @@ def initialize_default_parser() -> argparse.ArgumentParser:
 def parse(args=None) -> Tuple[str, str, argparse.Namespace]:
     parser = initialize_default_parser()
     commandline_arguments = parser.parse_args(args)
-    token = (
-        os.environ['GITHUB_TOKEN']
-        if not args or not 'testcases' in args
-        else 'TOKEN'
-    )
-    user = (
-        os.environ['GITHUB_USER']
-        if not args or not 'testcases' in args
-        else 'USER'
-    )
+    if args and 'testcases' in args:
+        return ('USER', 'TOKEN', commandline_arguments)
+
+    token = os.environ.get('GITHUB_TOKEN', '')
+    user = os.environ.get('GITHUB_USER', '')
+    if not token:
+        raise ValueError('GITHUB_TOKEN environment variable is not set.')
+    if not user:
+        raise ValueError('GITHUB_USER environment variable is not set.')
+
     return (user, token, commandline_arguments)
 
 
@@ -187,21 +190,41 @@ def commit_files(
     git_signing_key: str,
     shell_cmd_runner: Callable,
 ):
-    shell_cmd_runner("git add {}".format(filename))
+    shell_cmd_runner("git add {} CHANGELOG.md".format(shlex.quote(filename)))
     shell_cmd_runner("git add *__version__.py || echo 'ignoring __version__'")
-    shell_cmd_runner("git add CHANGELOG.md")
     shell_cmd_runner(
-        "git commit -S{} -m '{}'".format(git_signing_key or '', commit_msg),
+        "git commit -S{} -m {}".format(
+            shlex.quote(git_signing_key) if git_signing_key else '',
+            shlex.quote(commit_msg),
+        ),
     )
 
 
+def write_atomically(file_path: Path, content: str) -> None:
+    """
+    Writes content to a temporary file next to file_path and moves it over
+    file_path afterwards. Therefore file_path is never left half written and
+    keeps its permissions.
+    """
+    tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+    try:
+        tmp_path.write_text(content)
+        if file_path.exists():
+            shutil.copymode(str(file_path), str(tmp_path))
+        tmp_path.replace(file_path)
+    except Exception:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
 def upload_assets(
     username: str,
     token: str,
     pathnames: List[str],
     github_json: Dict,
     path: Path,
-    requests_module: requests,
+    requests_module: Union[ModuleType, requests.Session],
 ) -> bool:
     print("Uploading assets: {}".format(pathnames))
 
@@ -261,25 +284,33 @@ def prepare(
     if git_version.encode() in git_tags.stdout.splitlines():
         raise ValueError('git tag {} is already taken.'.format(git_version))
 
-    executed, filename = update_version(
-        release_version, version_module, develop=False
-    )
-    if not executed:
-        return False
+    change_log_path = path.cwd() / 'CHANGELOG.md'
 
-    print("updated version {} to {}".format(filename, release_version))
+    def update_changelog():
+        return changelog_module.update(
+            change_log_path.read_text(),
+            release_version,
+            git_tag_prefix=git_tag_prefix,
+        )
 
-    change_log_path = path.cwd() / 'CHANGELOG.md'
-    updated, changelog_text = changelog_module.update(
-        change_log_path.read_text(),
-        release_version,
-        git_tag_prefix=git_tag_prefix,
-    )
+    # the project files and the changelog are independent of each other.
+    # the changelog is only written after the version update succeeded.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        changelog_update = executor.submit(update_changelog)
+        executed, filename = update_version(
+            release_version, version_module, develop=False
+        )
+        if not executed:
+            return False
+
+        print("updated version {} to {}".format(filename, release_version))
+
+        updated, changelog_text = changelog_update.result()
 
     if not updated:
         raise ValueError("No unreleased text found in CHANGELOG.md")
 
-    change_log_path.write_text(updated)
+    write_atomically(change_log_path, updated)
 
     print("Updated CHANGELOG.md")
 
@@ -295,13 +326,17 @@ def prepare(
 
     if git_signing_key:
         shell_cmd_runner(
-            "git tag -u {} {} -m '{}'".format(
-                git_signing_key, git_version, commit_msg
+            "git tag -u {} {} -m {}".format(
+                shlex.quote(git_signing_key),
+                shlex.quote(git_version),
+                shlex.quote(commit_msg),
             ),
         )
     else:
         shell_cmd_runner(
-            "git tag -s {} -m '{}'".format(git_version, commit_msg),
+            "git tag -s {} -m {}".format(
+                shlex.quote(git_version), shlex.quote(commit_msg)
+            ),
         )
 
     release_text = path(RELEASE_TEXT_FILE)
@@ -321,7 +356,7 @@ def prepare(
         git_tag_prefix=git_tag_prefix,
         git_space=space,
     )
-    change_log_path.write_text(updated)
+    write_atomically(change_log_path, updated)
 
     commit_msg = (
         f'* Update to version {next_version}\n'
@@ -350,7 +385,7 @@ def release(
     path: Path,
     username: str,
     token: str,
-    requests_module: requests,
+    requests_module: Union[ModuleType, requests.Session],
     **_kwargs,
 ) -> bool:
     project: str = args.project
@@ -364,7 +399,9 @@ def release(
     print("Pushing changes")
 
     if git_remote_name:
-        shell_cmd_runner("git push --follow-tags {}".format(git_remote_name))
+        shell_cmd_runner(
+            "git push --follow-tags {}".format(shlex.quote(git_remote_name))
+        )
     else:
         shell_cmd_runner("git push --follow-tags")
 
@@ -402,7 +439,7 @@ def sign(
     path: Path,
     username: str,
     token: str,
-    requests_module: requests,
+    requests_module: Union[ModuleType, requests.Session],
     **_kwargs,
 ) -> bool:
     def download(url, filename):
@@ -446,8 +483,12 @@ def sign(
     print("Signing {}".format([zip_path, tar_path]))
 
     gpg_cmd = "gpg --default-key {} --detach-sign --armor {}"
-    shell_cmd_runner(gpg_cmd.format(signing_key, zip_path))
-    shell_cmd_runner(gpg_cmd.format(signing_key, tar_path))
+    shell_cmd_runner(
+        gpg_cmd.format(shlex.quote(signing_key), shlex.quote(str(zip_path)))
+    )
+    shell_cmd_runner(
+        gpg_cmd.format(shlex.quote(signing_key), shlex.quote(str(tar_path)))
+    )
 
     return upload_assets(
         username,
@@ -477,6 +518,9 @@ def main(
 ):
     username, token, parsed_args = parse(args)
 
+    # reuse the connection to the GitHub API for all requests of a command
+    session = requests.Session() if _requests is requests else None
+
     try:
         if not parsed_args.func(
             shell_cmd_runner,
@@ -485,7 +529,7 @@ def main(
             username=username,
             token=token,
             changelog_module=_changelog,
-            requests_module=_requests,
+            requests_module=session or _requests,
             version_module=_version,
         ):
             return sys.exit(1) if leave else False
@@ -495,6 +539,9 @@ def main(
             file=sys.stderr,
         )
         sys.exit(1)
+    finally:
+        if session:
+            session.close()
 
     return sys.exit(0) if leave else True
 
@@ -74,7 +74,7 @@ def _find_copyright(
     regex: re.Pattern,
 ) -> Tuple[bool, Union[Dict[str, Union[str, None]], None]]:
     """Match the line for the regex"""
-    copyright_match = re.search(regex, line)
+    copyright_match = regex.search(line)
     if copyright_match:
         return (
             True,
@@ -170,7 +170,7 @@ def _update_file(
                     f'Copyright (C) {copyright_match["creation_year"]}'
                     f'-{args.year} {copyright_match["company"]}'
                 )
-                new_line = re.sub(regex, copyright_term, line)
+                new_line = regex.sub(copyright_term, line)
                 fp_write = fp.tell() - len(line)  # save position to insert
                 rest_of_file = fp.read()
                 fp.seek(fp_write)
@@ -16,6 +16,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import bisect
 import re
 import traceback
 
@@ -109,18 +110,20 @@ class CMakeVersionParser:
         self._project_dev_version_line_number = pd_line_no
         self._project_dev_version = pd
 
-    __cmake_scanner = re.Scanner(
-        [
-            (r'#.*', lambda _, token: ("comment", token)),
-            (r'"[^"]*"', lambda _, token: ("string", token)),
-            (r'"[0-9]+"', lambda _, token: ("number", token)),
-            (r"\(", lambda _, token: ("open_bracket", token)),
-            (r"\)", lambda _, token: ("close_bracket", token)),
-            (r'[^ \t\r\n()#"]+', lambda _, token: ("word", token)),
-            (r'\n', lambda _, token: ("newline", token)),
-            # to have spaces etc correctly
-            (r"\s+", lambda _, token: ("special_printable", token)),
-        ]
+    __cmake_tokens = re.compile(
+        '|'.join(
+            [
+                r'(?P<comment>#.*)',
+                r'(?P<string>"[^"]*")',
+                r'(?P<number>"[0-9]+")',
+                r'(?P<open_bracket>\()',
+                r'(?P<close_bracket>\))',
+                r'(?P<word>[^ \t\r\n()#"]+)',
+                r'(?P<newline>\n)',
+                # to have spaces etc correctly
+                r'(?P<special_printable>\s+)',
+            ]
+        )
     )
 
     def get_current_version(self) -> str:
@@ -206,12 +209,22 @@ class CMakeVersionParser:
         Tuple[int, str, str],
         Tuple[int, str, str],
     ]:
-        toks, remainder = self.__cmake_scanner.scan(content)
-        if remainder != '':
-            print('WARNING: unrecognized cmake tokens: {}'.format(remainder))
-
-        line_num = 0
-
-        for tok_type, tok_contents in toks:
-            line_num += tok_contents.count('\n')
-            yield line_num, tok_type, tok_contents.strip()
+        newlines = []
+        position = content.find('\n')
+        while position >= 0:
+            newlines.append(position)
+            position = content.find('\n', position + 1)
+
+        end = 0
+        for match in self.__cmake_tokens.finditer(content):
+            if match.start() != end:
+                break
+            end = match.end()
+            # line of the token is the count of newlines up to its end
+            line_num = bisect.bisect_left(newlines, end)
+            yield line_num, match.lastgroup, match.group().strip()
+
+        if end != len(content):
+            print(
+                'WARNING: unrecognized cmake tokens: {}'.format(content[end:])
+            )
@@ -16,7 +16,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import argparse
-import importlib
+import functools
 import re
 
 from pathlib import Path
@@ -26,6 +26,18 @@ import tomlkit
 
 from packaging.version import Version, InvalidVersion
 
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+_SAFE_VERSION_RE = re.compile(r'[^A-Za-z0-9.]+')
+# release segments without leading zeros are already in PEP 440 normal form
+_CANONICAL_VERSION_RE = re.compile(r'(?:0|[1-9][0-9]*)(?:\.(?:0|[1-9][0-9]*))+')
+_VERSION_LITERAL_RE = re.compile(
+    r'^__version__\s*=\s*["\']([^"\']+)["\']', re.MULTILINE
+)
+
 
 class VersionError(Exception):
     """
@@ -45,6 +57,7 @@ def strip_version(version: str) -> str:
     return version
 
 
+@functools.lru_cache(maxsize=256)
 def safe_version(version: str) -> str:
     """
     Returns the version as a string in `PEP440`_ compliant
@@ -53,11 +66,28 @@ def safe_version(version: str) -> str:
     .. _PEP440:
        https://www.python.org/dev/peps/pep-0440
     """
+    if _CANONICAL_VERSION_RE.fullmatch(version):
+        return version
+
     try:
         return str(Version(version))
     except InvalidVersion:
         version = version.replace(' ', '.')
-        return re.sub('[^A-Za-z0-9.]+', '-', version)
+        return _SAFE_VERSION_RE.sub('-', version)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_pyproject_toml(content: str):
+    """
+    Parses the content of a pyproject.toml file for read-only lookups.
+
+    The result is cached and must not be modified. Uses tomllib if available
+    because it is a lot faster than tomlkit, which preserves the formatting.
+    """
+    if tomllib:
+        return tomllib.loads(content)
+
+    return tomlkit.parse(content)
 
 
 def get_version_from_pyproject_toml(pyproject_toml_path: Path = None) -> str:
@@ -74,13 +104,18 @@ def get_version_from_pyproject_toml(pyproject_toml_path: Path = None) -> str:
             '{} file not found.'.format(str(pyproject_toml_path))
         )
 
-    pyproject_toml = tomlkit.parse(pyproject_toml_path.read_text())
-    if (
-        'tool' in pyproject_toml
-        and 'poetry' in pyproject_toml['tool']
-        and 'version' in pyproject_toml['tool']['poetry']
-    ):
-        return pyproject_toml['tool']['poetry']['version']
+    pyproject_toml = _load_pyproject_toml(pyproject_toml_path.read_text())
+    return _get_version_from_pyproject(pyproject_toml, pyproject_toml_path)
+
+
+def _get_version_from_pyproject(
+    pyproject_toml, pyproject_toml_path: Path
+) -> str:
+    tool = pyproject_toml.get('tool') or {}
+    poetry = tool.get('poetry') or {}
+    version = poetry.get('version')
+    if version is not None:
+        return version
 
     raise VersionError(
         'Version information not found in {} file.'.format(
@@ -89,6 +124,20 @@ def get_version_from_pyproject_toml(pyproject_toml_path: Path = None) -> str:
     )
 
 
+def _set_version_in_pyproject(pyproject_toml, version: str) -> None:
+    tool = pyproject_toml.get('tool')
+    if tool is None:
+        tool = tomlkit.table()
+        pyproject_toml['tool'] = tool
+
+    poetry = tool.get('poetry')
+    if poetry is None:
+        poetry = tomlkit.table()
+        tool.add('poetry', poetry)
+
+    poetry['version'] = version
+
+
 def versions_equal(new_version: str, old_version: str) -> bool:
     """
     Checks if new_version and old_version are equal
@@ -96,6 +145,7 @@ def versions_equal(new_version: str, old_version: str) -> bool:
     return safe_version(old_version) == safe_version(new_version)
 
 
+@functools.lru_cache(maxsize=256)
 def is_version_pep440_compliant(version: str) -> bool:
     """
     Checks if the provided version is a PEP 440 compliant version string
@@ -173,21 +223,24 @@ __version__ = "{}"\n"""
             print(*args)
 
     def get_current_version(self) -> str:
-        version_module_name = self.version_file_path.stem
-        module_parts = list(self.version_file_path.parts[:-1]) + [
-            version_module_name
-        ]
-        module_name = '.'.join(module_parts)
         try:
-            version_module = importlib.import_module(module_name)
-        except ModuleNotFoundError:
+            content = self.version_file_path.read_text()
+        except FileNotFoundError:
             raise VersionError(
-                'Could not load version from {}. Import failed.'.format(
-                    module_name
+                'Could not load version from {}. File not found.'.format(
+                    str(self.version_file_path)
                 )
             ) from None
 
-        return version_module.__version__
+        match = _VERSION_LITERAL_RE.search(content)
+        if not match:
+            raise VersionError(
+                'Could not load version from {}. __version__ not set.'.format(
+                    str(self.version_file_path)
+                )
+            )
+
+        return match.group(1)
 
     def update_version_file(self, new_version: str) -> None:
         """
@@ -204,19 +257,9 @@ __version__ = "{}"\n"""
         """
         Update the version in the pyproject.toml file
         """
-        version = safe_version(new_version)
-
         pyproject_toml = tomlkit.parse(self.pyproject_toml_path.read_text())
 
-        if 'tool' not in pyproject_toml:
-            tool_table = tomlkit.table()
-            pyproject_toml['tool'] = tool_table
-
-        if 'poetry' not in pyproject_toml['tool']:
-            poetry_table = tomlkit.table()
-            pyproject_toml['tool'].add('poetry', poetry_table)
-
-        pyproject_toml['tool']['poetry']['version'] = version
+        _set_version_in_pyproject(pyproject_toml, safe_version(new_version))
 
         self.pyproject_toml_path.write_text(tomlkit.dumps(pyproject_toml))
 
@@ -226,8 +269,10 @@ __version__ = "{}"\n"""
                 'Could not find {} file.'.format(str(self.pyproject_toml_path))
             )
 
-        pyproject_version = get_version_from_pyproject_toml(
-            pyproject_toml_path=self.pyproject_toml_path
+        # parse the file only once for reading and updating the version
+        pyproject_toml = tomlkit.parse(self.pyproject_toml_path.read_text())
+        pyproject_version = _get_version_from_pyproject(
+            pyproject_toml, self.pyproject_toml_path
         )
 
         if not self.version_file_path.exists():
@@ -239,7 +284,8 @@ __version__ = "{}"\n"""
             self._print('Version is already up-to-date.')
             return
 
-        self.update_pyproject_version(new_version=new_version)
+        _set_version_in_pyproject(pyproject_toml, safe_version(new_version))
+        self.pyproject_toml_path.write_text(tomlkit.dumps(pyproject_toml))
 
         self.update_version_file(new_version=new_version)
 
@@ -317,7 +363,7 @@ class PontosVersionCommand(VersionCommand):
                 '{} file not found.'.format(str(pyproject_toml_path))
             )
 
-        pyproject_toml = tomlkit.parse(pyproject_toml_path.read_text())
+        pyproject_toml = _load_pyproject_toml(pyproject_toml_path.read_text())
 
         if (
             'tool' not in pyproject_toml
@@ -336,7 +382,7 @@ class PontosVersionCommand(VersionCommand):
             version_file_path = Path(
                 pontos_version_settings['version-module-file']
             )
-        except tomlkit.exceptions.NonExistentKey:
+        except KeyError:
             raise VersionError(
                 'version-module-file key not set in [tool.pontos.version] '
                 'section of {}.'.format(str(pyproject_toml_path))
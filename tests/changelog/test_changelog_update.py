@@ -18,6 +18,7 @@
 from datetime import date
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 
 from pontos import changelog
 
@@ -41,7 +42,7 @@ class ChangelogUpdateTestCase(unittest.TestCase):
         test_md = Path(path).read_text()
         updated, release_notes = changelog.update(test_md, '1.2.3', 'hidden')
         self.assertEqual(expeced_changelog, updated)
-        self.assertEqual(expeced_release_notes, release_notes)
+        self.assertEqual(expeced_release_notes.strip('\n'), release_notes)
 
     def test_markdown_empty_updated_and_changelog_on_no_unreleased(self):
         test_md = """
@@ -53,6 +54,19 @@ something, somehing
 ### added
 - cool stuff 1
 - cool stuff 2
+"""
+        updated, release_notes = changelog.update(test_md, '1.2.3', 'hidden')
+        self.assertIs('', updated)
+        self.assertIs('', release_notes)
+
+    def test_markdown_empty_updated_and_changelog_without_unreleased_text(
+        self,
+    ):
+        test_md = """
+# Changelog
+## 1.0.0
+### added
+- cool stuff 1
 """
         updated, release_notes = changelog.update(test_md, '1.2.3', 'hidden')
         self.assertIs('', updated)
@@ -86,7 +100,7 @@ I don't recognize it anymore
         released_md = released
         updated, release_notes = changelog.update(test_md, '1.2.3')
         self.assertEqual(released_md.strip(), updated.strip())
-        self.assertEqual(released.strip(), release_notes.strip())
+        self.assertEqual(released.strip(), release_notes)
 
     def test_update_markdown_return_changelog(self):
         released = """
@@ -125,7 +139,7 @@ something, somehing
         released_md = test_md_template.format(released)
         updated, release_notes = changelog.update(test_md, '1.2.3')
         self.assertEqual(released_md.strip(), updated.strip())
-        self.assertEqual(released.strip(), release_notes.strip())
+        self.assertEqual(released.strip(), release_notes)
 
     def test_identify_heading_abort_condition_correctly(self):
         released = """
@@ -166,7 +180,56 @@ something, somehing
         released_md = test_md_template.format(released)
         updated, release_notes = changelog.update(test_md, '1.2.3')
         self.assertEqual(released_md.strip(), updated.strip())
-        self.assertEqual(released.strip(), release_notes.strip())
+        self.assertEqual(released.strip(), release_notes)
+
+    def test_update_replaces_only_compared_ref_in_link(self):
+        test_md = """## [Unreleased]
+### added
+so little
+[Unreleased]: https://github.com/masters/HEADS/compare/v1.0.0...master"""
+
+        _, release_notes = changelog.update(test_md, '1.2.3')
+
+        self.assertIn(
+            '[1.2.3]: https://github.com/masters/HEADS/compare/v1.0.0...v1.2.3',
+            release_notes,
+        )
+
+    def test_update_many(self):
+        test_md = """# Changelog
+## [Unreleased]
+### added
+so little
+[Unreleased]: https://github.com/greenbone/pontos/compare/v1.0.0...HEAD
+## 1.0.0
+### added
+- cool stuff 1"""
+        no_unreleased_md = """# Changelog
+## 1.0.0
+### added
+- cool stuff 1"""
+
+        results = changelog.update_many(
+            [test_md, no_unreleased_md, test_md], '1.2.3'
+        )
+
+        expected = changelog.update(test_md, '1.2.3')
+        self.assertEqual(results, [expected, ('', ''), expected])
+
+    @patch('pontos.changelog.changelog.date')
+    def test_update_uses_current_date_on_repeated_calls(self, date_mock):
+        test_md = """## [Unreleased]
+### added
+so little
+[Unreleased]: https://github.com/greenbone/pontos/compare/v1.0.0...HEAD"""
+
+        date_mock.today.return_value = date(2020, 7, 31)
+        _, release_notes = changelog.update(test_md, '1.2.3')
+        self.assertIn('## [1.2.3] - 2020-07-31', release_notes)
+
+        date_mock.today.return_value = date(2020, 8, 1)
+        _, release_notes = changelog.update(test_md, '1.2.3')
+        self.assertIn('## [1.2.3] - 2020-08-01', release_notes)
 
     def test_add_skeleton_adds_keep_a_changelog_skeleton_before_version(self):
         keep_a_changelog_skeleton = """
@@ -208,3 +271,11 @@ something, somehing
         )
         updated = changelog.add_skeleton(test_md, '1.2.3', 'hidden')
         self.assertEqual(released_md.strip(), updated.strip())
+
+    def test_add_skeleton_without_version_heading(self):
+        test_md = """# Changelog
+## 1.0.0
+### added
+- cool stuff 1"""
+        updated = changelog.add_skeleton(test_md, '1.2.3', 'hidden')
+        self.assertEqual(test_md, updated)
@@ -18,6 +18,8 @@
 # pylint: disable=C0413,W0108
 
 import shutil
+import stat
+import tempfile
 import unittest
 
 from dataclasses import dataclass
@@ -27,6 +29,7 @@ from unittest.mock import MagicMock, patch
 import requests
 
 from pontos import version, release, changelog
+from pontos.release.release import parse, write_atomically
 
 
 @dataclass
@@ -403,3 +406,135 @@ class SignTestCase(unittest.TestCase):
             args=args,
         )
         self.assertTrue(released)
+
+
+class ParseTestCase(unittest.TestCase):
+    args = [
+        '--project',
+        'foo',
+        'release',
+        '--release-version',
+        '0.0.1',
+    ]
+
+    @patch.dict('os.environ', {'GITHUB_USER': 'user'}, clear=True)
+    def test_fail_without_github_token(self):
+        with self.assertRaisesRegex(ValueError, 'GITHUB_TOKEN'):
+            parse(self.args)
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'token'}, clear=True)
+    def test_fail_without_github_user(self):
+        with self.assertRaisesRegex(ValueError, 'GITHUB_USER'):
+            parse(self.args)
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'token', 'GITHUB_USER': 'user'})
+    def test_parse_user_and_token(self):
+        user, token, _ = parse(self.args)
+
+        self.assertEqual(user, 'user')
+        self.assertEqual(token, 'token')
+
+
+class WriteAtomicallyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_replace_content(self):
+        file_path = self.directory / 'CHANGELOG.md'
+        file_path.write_text('old')
+
+        write_atomically(file_path, 'new')
+
+        self.assertEqual(file_path.read_text(), 'new')
+        self.assertEqual(list(self.directory.iterdir()), [file_path])
+
+    def test_create_file(self):
+        file_path = self.directory / 'CHANGELOG.md'
+
+        write_atomically(file_path, 'new')
+
+        self.assertEqual(file_path.read_text(), 'new')
+        self.assertEqual(list(self.directory.iterdir()), [file_path])
+
+    def test_keep_permissions(self):
+        file_path = self.directory / 'CHANGELOG.md'
+        file_path.write_text('old')
+        file_path.chmod(0o640)
+
+        write_atomically(file_path, 'new')
+
+        self.assertEqual(stat.S_IMODE(file_path.stat().st_mode), 0o640)
+
+    def test_remove_temporary_file_on_error(self):
+        # a non empty directory can't be replaced by a file
+        file_path = self.directory / 'CHANGELOG.md'
+        file_path.mkdir()
+        (file_path / 'foo').write_text('foo')
+
+        with self.assertRaises(OSError):
+            write_atomically(file_path, 'new')
+
+        self.assertEqual(list(self.directory.iterdir()), [file_path])
+
+
+@patch("pontos.release.release.shutil", new=_shutil_mock)
+class RequestsSessionTestCase(unittest.TestCase):
+    args = [
+        '--project',
+        'testcases',
+        'release',
+        '--release-version',
+        '0.0.1',
+    ]
+
+    @patch('requests.Session')
+    def test_use_and_close_session(self, session_mock):
+        session = session_mock.return_value
+        session.post.return_value.status_code = 201
+
+        released = release.main(
+            shell_cmd_runner=lambda x: StdOutput(''),
+            _path=MagicMock(spec=Path),
+            leave=False,
+            args=self.args,
+        )
+
+        self.assertTrue(released)
+        session.post.assert_called_once()
+        session.close.assert_called_once_with()
+
+    @patch('requests.Session')
+    def test_close_session_on_failed_command(self, session_mock):
+        session = session_mock.return_value
+        session.post.return_value.status_code = 401
+        session.post.return_value.text = '{}'
+
+        released = release.main(
+            shell_cmd_runner=lambda x: StdOutput(''),
+            _path=MagicMock(spec=Path),
+            leave=False,
+            args=self.args,
+        )
+
+        self.assertFalse(released)
+        session.post.assert_called_once()
+        session.close.assert_called_once_with()
+
+    @patch('requests.Session')
+    def test_close_session_on_error(self, session_mock):
+        session = session_mock.return_value
+        session.post.side_effect = requests.ConnectionError
+
+        with self.assertRaises(requests.ConnectionError):
+            release.main(
+                shell_cmd_runner=lambda x: StdOutput(''),
+                _path=MagicMock(spec=Path),
+                leave=False,
+                args=self.args,
+            )
+
+        session.close.assert_called_once_with()
@@ -0,0 +1,44 @@
+# Copyright (C) 2020-2021 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+
+from pontos.version import VersionCommand
+from pontos.version.version import initialize_default_parser
+
+
+class ExtraArgumentVersionCommand(VersionCommand):
+    def _configure_parser(self):
+        super()._configure_parser()
+        self.parser.add_argument('--extra', action='store_true')
+
+
+class ConfigureParserTestCase(unittest.TestCase):
+    def test_extend_parser_in_subclass(self):
+        ExtraArgumentVersionCommand()
+        cmd = ExtraArgumentVersionCommand()
+
+        args = cmd.parser.parse_args(['--extra', 'show'])
+
+        self.assertTrue(args.extra)
+
+    def test_extended_parser_is_not_shared(self):
+        ExtraArgumentVersionCommand()
+
+        with self.assertRaises(SystemExit):
+            initialize_default_parser().parse_args(['--extra', 'show'])
@@ -17,7 +17,10 @@
 
 import unittest
 
-from pontos.version import VersionCommand
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from pontos.version import VersionCommand, VersionError
 
 
 class FooVersionCommand(VersionCommand):
@@ -31,3 +34,40 @@ class GetCurrentVersionTestCase(unittest.TestCase):
     def test_get_current_version(self):
         cmd = FooVersionCommand()
         self.assertEqual(cmd.get_current_version(), '2.3.4')
+
+    def test_get_current_version_from_file(self):
+        fake_path_class = MagicMock(spec=Path)
+        fake_path = fake_path_class.return_value
+        fake_path.read_text.return_value = VersionCommand.TEMPLATE.format(
+            '1.2.3'
+        )
+
+        cmd = VersionCommand(version_file_path=fake_path)
+
+        self.assertEqual(cmd.get_current_version(), '1.2.3')
+
+    def test_version_file_not_found(self):
+        fake_path_class = MagicMock(spec=Path)
+        fake_path = fake_path_class.return_value
+        fake_path.__str__.return_value = '__version__.py'
+        fake_path.read_text.side_effect = FileNotFoundError
+
+        cmd = VersionCommand(version_file_path=fake_path)
+
+        with self.assertRaisesRegex(
+            VersionError, 'Could not load version from __version__.py'
+        ):
+            cmd.get_current_version()
+
+    def test_no_version_in_file(self):
+        fake_path_class = MagicMock(spec=Path)
+        fake_path = fake_path_class.return_value
+        fake_path.__str__.return_value = '__version__.py'
+        fake_path.read_text.return_value = '# no version here'
+
+        cmd = VersionCommand(version_file_path=fake_path)
+
+        with self.assertRaisesRegex(
+            VersionError, 'Could not load version from __version__.py'
+        ):
+            cmd.get_current_version()
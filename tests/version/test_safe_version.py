@@ -52,3 +52,14 @@ class SafeVersionTestCase(unittest.TestCase):
         self.assertEqual(safe_version('1.2'), '1.2')
         self.assertEqual(safe_version('1.2.3'), '1.2.3')
         self.assertEqual(safe_version('22.4'), '22.4')
+
+    def test_normalized_release_versions(self):
+        self.assertEqual(safe_version('1.2.3'), '1.2.3')
+        self.assertEqual(safe_version('0.10.0'), '0.10.0')
+
+    def test_release_versions_with_leading_zeros(self):
+        self.assertEqual(safe_version('1.02'), '1.2')
+        self.assertEqual(safe_version('01.2.03'), '1.2.3')
+
+    def test_release_version_with_trailing_newline(self):
+        self.assertEqual(safe_version('1.2.3\n'), '1.2.3')